@@ -0,0 +1,316 @@
+"""Shared data access and rendering for the inventory pages.
+
+Every st.cache_resource / st.cache_data entry lives in this module, so
+any Streamlit page that imports it shares one set of dataset handles
+and one per-ASIN cache instead of duplicating the working set per
+script.
+"""
+
+import os
+
+import duckdb
+import streamlit as st
+import pandas as pd
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
+import plotly.graph_objects as go
+
+# ==========================================
+# CONFIG
+# ==========================================
+INVENTORY_FILE = "master_inventory_data.parquet"
+ORDERS_FILE = "master_order_data.parquet"
+INVENTORY_DATASET = "inventory_dataset"
+META_FILE = "_meta.parquet"
+ASINS_FILE = "asins.parquet"
+
+# Only the columns the dashboard actually touches are ever read; the
+# parquet pages of everything else stay on disk.
+INV_COLS = ['Date', 'asin', 'Region', 'Fulfillable Quantity', 'Reserved', 'Inbound', 'product-name', 'sku']
+ORD_COLS = ['asin', 'Target_Region', 'Warehouse', 'Order Date', 'Dispatch Date', 'Quantity', 'Order ID', 'Channel Name', 'sku']
+
+# Prefer the Hive-partitioned dataset written by process_data.py: pyarrow
+# then prunes whole files by asin/Region before touching a row group.
+# The flat master file stays as a fallback.
+INVENTORY_SOURCE = INVENTORY_DATASET if os.path.isdir(INVENTORY_DATASET) else INVENTORY_FILE
+
+# DuckDB pushes the asin predicate and the column projection into the
+# parquet scan itself and runs the whole melt + groupby as one
+# vectorized query plan — no Python in the loop. Result schema matches
+# what the charts slice: (Target_Region, Warehouse, ev_type, ev_date,
+# Quantity_sum).
+ORDER_EVENTS_SQL = """
+    SELECT Target_Region, Warehouse, 'placed' AS ev_type, "Order Date" AS ev_date, SUM(Quantity)::BIGINT AS Quantity_sum
+    FROM read_parquet(?) WHERE asin = ?
+    GROUP BY 1, 2, 3, 4
+    UNION ALL
+    SELECT Target_Region, Warehouse, 'dispatched', "Dispatch Date", SUM(Quantity)::BIGINT
+    FROM read_parquet(?) WHERE asin = ? AND "Dispatch Date" IS NOT NULL
+    GROUP BY 1, 2, 3, 4
+    ORDER BY ev_date
+"""
+
+# ==========================================
+# DATA LOADING
+# ==========================================
+# Open the parquet files as lazy datasets instead of reading them whole.
+# Nothing is deserialized until a filter is applied, so each rerun only
+# pulls the row groups / columns for the ASIN being viewed.
+def open_dataset(path, partitioning=None):
+    try:
+        # use_mmap reads through memory-mapped pages, so concurrent
+        # sessions share the OS page cache instead of private buffers
+        return ds.dataset(path, format='parquet', partitioning=partitioning,
+                          filesystem=pafs.LocalFileSystem(use_mmap=True))
+    except FileNotFoundError:
+        return None
+
+@st.cache_resource
+def open_datasets():
+    # cache_resource, not cache_data: the handles are read-only and
+    # unpicklable, and one pair per process is shared by every session
+    # and rerun instead of being re-parsed from file metadata each time.
+    return open_dataset(INVENTORY_SOURCE, partitioning='hive'), open_dataset(ORDERS_FILE)
+
+@st.cache_resource
+def get_duck():
+    return duckdb.connect()
+
+@st.cache_data
+def get_date_bounds():
+    # Sidebar defaults come from the tiny _meta.parquet sidecar when
+    # process_data.py has written one; otherwise fall back to scanning
+    # just the Date column.
+    if os.path.exists(META_FILE):
+        meta = pq.read_table(META_FILE)
+        return pd.Timestamp(meta['min_date'][0].as_py()), pd.Timestamp(meta['max_date'][0].as_py())
+    inv_ds, _ = open_datasets()
+    bounds = pc.min_max(inv_ds.to_table(columns=['Date'])['Date']).as_py()
+    return pd.Timestamp(bounds['min']), pd.Timestamp(bounds['max'])
+
+@st.cache_data
+def get_known_asins():
+    # Sidecar written by process_data.py: a typo'd or unknown ASIN gets
+    # rejected with a set lookup instead of an (empty) dataset scan.
+    if os.path.exists(ASINS_FILE):
+        return frozenset(pq.read_table(ASINS_FILE)['asin'].to_pylist())
+    return None
+
+def range_slice(df, col, start, end):
+    # df must be sorted by col: two binary searches and a zero-copy
+    # slice replace the two O(N) boolean masks of a range filter.
+    lo = df[col].searchsorted(start, side='left')
+    hi = df[col].searchsorted(end, side='right')
+    return df.iloc[lo:hi]
+
+def freeze(df):
+    # The per-ASIN cache hands out a shared object, not a copy, so lock
+    # the column buffers. Arrow-backed columns are immutable already and
+    # have no writeable flag.
+    for c in df.columns:
+        v = df[c].values
+        if hasattr(v, 'flags'):
+            v.flags.writeable = False
+    return df
+
+def as_categorical(df, cols):
+    # Low-cardinality string columns become int8 codes: equality filters
+    # and groupbys then compare codes instead of Python strings, and
+    # memory drops to ~1 byte per cell.
+    for c in cols:
+        df[c] = df[c].astype('category')
+    return df
+
+@st.cache_resource(show_spinner=False)
+def load_asin(asin):
+    # One cache entry per ASIN holding both inventory and orders. The
+    # first lookup pays the (pruned) parquet reads, every widget change
+    # after that is a hash hit; the date range is sliced in-memory from
+    # these small frames so it stays outside the cache key.
+    # cache_resource rather than cache_data: the result is read-only
+    # (frozen below), so the pickle/deep-copy cache_data performs on
+    # every access would be pure overhead.
+    inv_ds, ord_ds = open_datasets()
+    inv = inv_ds.to_table(filter=ds.field('asin') == asin, columns=INV_COLS).to_pandas()
+    # Stable Date sort (region order within a day is preserved) so the
+    # date-range filter can be a binary-search slice.
+    inv = inv.sort_values('Date', kind='stable', ignore_index=True)
+    inv = as_categorical(inv, ['asin', 'Region', 'sku'])
+    # No-op when the dataset was written as uint32 by process_data.py;
+    # shrinks the int64 columns of the flat master file otherwise.
+    for c in ['Fulfillable Quantity', 'Reserved', 'Inbound']:
+        inv[c] = pd.to_numeric(inv[c], downcast='unsigned')
+
+    # The charts need the full order history for the ASIN (a dispatch can
+    # land inside the window for an order placed before it), so only the
+    # ASIN predicate is pushed down here.
+    orders = pd.DataFrame()
+    ord_agg = None
+    if ord_ds is not None:
+        ord_tbl = ord_ds.to_table(filter=ds.field('asin') == asin, columns=ORD_COLS)
+        orders = ord_tbl.to_pandas()
+        orders = orders.sort_values('Order Date', kind='stable', ignore_index=True)
+        orders = as_categorical(orders, ['asin', 'Target_Region', 'Warehouse', 'Channel Name', 'sku'])
+        orders['Quantity'] = pd.to_numeric(orders['Quantity'], downcast='unsigned')
+        # Fused bar aggregate (region x warehouse x event x day) in one
+        # DuckDB query, computed once per ASIN and shared by both charts.
+        ord_agg = get_duck().execute(ORDER_EVENTS_SQL, [ORDERS_FILE, asin, ORDERS_FILE, asin]).fetch_arrow_table()
+
+    return freeze(inv), freeze(orders), ord_agg
+
+# ==========================================
+# PLOTTING FUNCTION
+# ==========================================
+def create_combo_chart(inv_data, ord_agg, title, start_date, end_date, uirevision, is_eu=False):
+    fig = go.Figure()
+
+    # --- A. INVENTORY LINES (Left Axis) ---
+    # Scattergl renders through WebGL, which stays fast when a
+    # long date range puts thousands of points on screen.
+    # Hand plotly raw numpy views so its validators skip the
+    # Series-to-array conversion per trace.
+    x_dates = inv_data['Date'].values
+    fig.add_trace(go.Scattergl(x=x_dates, y=inv_data['Fulfillable Quantity'].values, name='Available', line=dict(color='green'), connectgaps=True))
+    fig.add_trace(go.Scattergl(x=x_dates, y=inv_data['Reserved'].values, name='Reserved', line=dict(color='orange'), connectgaps=True))
+    fig.add_trace(go.Scattergl(x=x_dates, y=inv_data['Inbound'].values, name='Inbound', line=dict(color='blue'), connectgaps=True))
+
+    # --- B. ORDER BARS (Overlay) ---
+    if ord_agg is not None and ord_agg.num_rows:
+        def add_bars(warehouse, ev_type, name, color):
+            sel = ord_agg.filter((pc.field('Warehouse') == warehouse) & (pc.field('ev_type') == ev_type))
+            if sel.num_rows:
+                # textposition='none' skips plotly's slow bar
+                # text placement pass entirely
+                fig.add_trace(go.Bar(x=sel['ev_date'].to_numpy(), y=sel['Quantity_sum'].to_numpy(), width=30000000, name=name, marker_color=color, opacity=0.6, textposition='none', cliponaxis=False))
+
+        # 1. Dawson Orders (Common to both)
+        add_bars('Dawson', 'placed', 'Order Placed (Dawson)', "#DE73E7")
+        add_bars('Dawson', 'dispatched', 'Dispatched (Dawson)', "#E4270E")
+
+        # 2. Romania Orders (EU Only)
+        if is_eu:
+            add_bars('Romania', 'placed', 'Order Placed (RO)', "#66F559")
+            add_bars('Romania', 'dispatched', 'Dispatched (RO)', "#096E11")
+
+    fig.update_layout(
+        title=title,
+        height=500,
+        hovermode="x",  # 'x unified' recomputes every trace label per mousemove
+        barmode='group',
+        xaxis_range=[start_date, end_date], # <--- FORCE X-AXIS TO SELECTED RANGE
+        uirevision=uirevision, # keep zoom/pan; date tweaks update in place instead of a full redraw
+        transition={'duration': 0}
+    )
+    return fig
+
+# ==========================================
+# PAGE RENDERING
+# ==========================================
+def render():
+    inv_ds, _ = open_datasets()
+    if inv_ds is None:
+        st.error(f"Missing {INVENTORY_FILE}. Please run process_data.py first.")
+        st.stop()
+
+    # --- SIDEBAR ---
+    st.sidebar.header("Filters")
+
+    # Date Logic
+    min_date, max_date = get_date_bounds()
+    today = pd.Timestamp.now().date()
+
+    # Set defaults: Start = Earliest Data, End = Today
+    start_date = pd.to_datetime(st.sidebar.date_input("Start Date", min_date))
+    end_date = pd.to_datetime(st.sidebar.date_input("End Date", today))
+
+    # Search Logic
+    target_asin = st.sidebar.text_input("Enter ASIN", value="", help="Enter ASIN to see Inventory & Orders").strip()
+
+    # --- MAIN LOGIC ---
+    st.title("📦 Inventory & Order History")
+
+    if not target_asin:
+        st.info("👈 Please enter an ASIN in the sidebar.")
+        return
+
+    # Fast rejection of ASINs that are not in the catalog at all
+    known_asins = get_known_asins()
+    if known_asins is not None and target_asin not in known_asins:
+        st.warning(f"No Inventory data found for {target_asin}.")
+        return
+
+    # 1. Cached per-ASIN lookup; only the cheap date slice runs per
+    # interaction
+    asin_inv, asin_orders, asin_ord_agg = load_asin(target_asin)
+    asin_inv_filtered = range_slice(asin_inv, 'Date', start_date, end_date)
+
+    if asin_inv_filtered.empty:
+        st.warning(f"No Inventory data found for {target_asin} in this period.")
+        return
+
+    # Product Info: read the two cells directly instead of boxing a
+    # whole row into a Series with iloc[-1]
+    latest_name = asin_inv_filtered['product-name'].values[-1]
+    latest_sku = asin_inv_filtered['sku'].values[-1]
+    st.write(f"**Product:** {latest_name} | **SKU:** {latest_sku}")
+
+    # Dynamic Hyperlink
+    amazon_url = f"https://sellercentral.amazon.co.uk/myinventory/inventory?fulfilledBy=all&page=1&pageSize=25&searchField=all&searchTerm={target_asin}&sort=date_created_desc&status=all&ref_=xx_invmgr_favb_xx"
+    st.markdown(f"🔗 [Click here to Amazon FBA]({amazon_url})")
+
+    # Split Data by Region: one groupby partition pass instead of a
+    # full boolean mask per region
+    inv_by_region = dict(list(asin_inv_filtered.groupby('Region', sort=False, observed=True)))
+    inv_uk = inv_by_region.get('UK', asin_inv_filtered.iloc[0:0])
+    inv_eu = inv_by_region.get('EU', asin_inv_filtered.iloc[0:0])
+
+    # Same for Orders, split on Target_Region
+    ord_by_region = dict(list(asin_orders.groupby('Target_Region', sort=False, observed=True))) if not asin_orders.empty else {}
+    ord_uk = ord_by_region.get('UK', pd.DataFrame())
+    ord_eu = ord_by_region.get('EU', pd.DataFrame())
+
+    # Region slices of the precomputed event aggregate (tiny tables)
+    agg_uk = asin_ord_agg.filter(pc.field('Target_Region') == 'UK') if asin_ord_agg is not None else None
+    agg_eu = asin_ord_agg.filter(pc.field('Target_Region') == 'EU') if asin_ord_agg is not None else None
+
+    # --- VISUALIZATION ---
+
+    # 1. UK PLOT
+    st.subheader("UK Overview")
+    st.plotly_chart(create_combo_chart(inv_uk, agg_uk, "UK Inventory & Orders", start_date, end_date, target_asin), use_container_width=True)
+
+    # 2. EU PLOT
+    st.subheader("EU Overview")
+    st.plotly_chart(create_combo_chart(inv_eu, agg_eu, "EU Inventory & Orders (Dawson + Romania)", start_date, end_date, target_asin, is_eu=True), use_container_width=True)
+
+    st.divider()
+
+    # --- ORDER TABLES ---
+    st.subheader("📋 Order History Details")
+
+    col1, col2 = st.columns(2)
+
+    # Column Helper
+    display_cols = ['Order ID', 'sku' , 'Order Date', 'Quantity', 'Channel Name' , 'Dispatch Date']
+
+    with col1:
+        st.write("**UK Orders**")
+        if not ord_uk.empty:
+            # Filter by selected date range for the table (region
+            # splits keep the loader's Order Date sort)
+            tbl_uk = range_slice(ord_uk, 'Order Date', start_date, end_date)
+            # Rows are already Order Date-sorted; newest-first is
+            # just a reversed view, no per-rerun sort
+            st.dataframe(tbl_uk[display_cols].iloc[::-1], hide_index=True)
+        else:
+            st.info("No UK Orders found.")
+
+    with col2:
+        st.write("**EU Orders**")
+        if not ord_eu.empty:
+            tbl_eu = range_slice(ord_eu, 'Order Date', start_date, end_date)
+            st.dataframe(tbl_eu[display_cols].iloc[::-1], hide_index=True)
+        else:
+            st.info("No EU Orders found.")
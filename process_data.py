@@ -0,0 +1,65 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# ==========================================
+# CONFIG
+# ==========================================
+INVENTORY_FILE = "master_inventory_data.parquet"
+ORDERS_FILE = "master_order_data.parquet"
+
+INVENTORY_DATASET = "inventory_dataset"
+META_FILE = "_meta.parquet"
+ASINS_FILE = "asins.parquet"
+
+
+# ==========================================
+# INVENTORY DATASET
+# ==========================================
+def build_inventory_dataset():
+    # Repartition the flat master file into a Hive-style dataset
+    # (inventory_dataset/asin=XXX/Region=UK/...). The dashboard filters
+    # by a single ASIN, so partitioning lets pyarrow skip every other
+    # file before any row group is even opened.
+    df = pd.read_parquet(INVENTORY_FILE)
+
+    # Sort so each partition is written contiguously and rows inside a
+    # partition file stay in Date order (contiguous row groups for the
+    # date-range predicate).
+    df = df.sort_values(['asin', 'Region', 'Date'], kind='stable')
+
+    # Quantities are small non-negative counts; storing them as uint32
+    # halves the column size on disk and in memory.
+    for c in ['Fulfillable Quantity', 'Reserved', 'Inbound']:
+        df[c] = df[c].astype('uint32')
+
+    ds.write_dataset(
+        pa.Table.from_pandas(df, preserve_index=False),
+        INVENTORY_DATASET,
+        format='parquet',
+        partitioning=['asin', 'Region'],
+        partitioning_flavor='hive',
+        max_partitions=1024 * 1024,
+        existing_data_behavior='delete_matching',
+    )
+    return df
+
+
+def build_meta(df):
+    # Tiny sidecars so the dashboard can fill its sidebar defaults and
+    # reject unknown ASINs without touching the full dataset.
+    meta = pa.table({
+        'min_date': [df['Date'].min()],
+        'max_date': [df['Date'].max()],
+    })
+    pq.write_table(meta, META_FILE)
+
+    asins = pa.table({'asin': df['asin'].unique()})
+    pq.write_table(asins, ASINS_FILE)
+
+
+if __name__ == "__main__":
+    df_inv = build_inventory_dataset()
+    build_meta(df_inv)
+    print(f"Wrote {INVENTORY_DATASET}/ ({df_inv['asin'].nunique()} ASINs), {META_FILE} and {ASINS_FILE}")